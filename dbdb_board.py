@@ -1,23 +1,26 @@
 import sys
 import json
+import functools
 import time
 import random
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import Optional, Dict, Any, List, Tuple
+import orjson
 import requests
 from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QVBoxLayout, QHBoxLayout,
-    QWidget, QPushButton, QTableWidget, QTableWidgetItem,
+    QWidget, QPushButton, QTableView,
     QLabel, QLineEdit, QSpinBox, QTextEdit, QTabWidget,
     QMessageBox, QProgressBar, QGroupBox, QCheckBox,
-    QStatusBar, QHeaderView
+    QStatusBar
 )
 from PyQt6.QtCore import (
-    QThread, QTimer, pyqtSignal, QObject, QMutex,
-    QMutexLocker, Qt, QDateTime
+    QTimer, pyqtSignal, pyqtSlot, QObject, Qt, QDateTime,
+    QAbstractTableModel, QModelIndex, QLocale
 )
 from PyQt6.QtGui import QFont, QColor
 
@@ -25,18 +28,27 @@ from PyQt6.QtGui import QFont, QColor
 class APIClient:
     """HTTP client for Flask API with connection pooling and retry logic"""
 
-    def __init__(self, base_url="http://localhost:5000", timeout=30):
+    RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+    IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'})
+
+    def __init__(self, base_url="http://localhost:5000", timeout=30,
+                 max_retries=3, backoff_factor=0.5, backoff_max=8.0):
         self.base_url = base_url.rstrip('/')
         self.timeout = timeout
         self.session = requests.Session()
 
-        # Configure retry strategy
-        retry_strategy = Retry(
-            total=3,
-            backoff_factor=0.5,
-            status_forcelist=[429, 500, 502, 503, 504],
+        # Retry strategy, applied per request in _make_request
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+
+        # Size the pool for the fetch worker, stats threads and GUI calls so
+        # concurrent requests reuse keep-alive sockets instead of opening new ones
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            pool_block=False,
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
 
@@ -46,20 +58,104 @@ class APIClient:
             'User-Agent': 'PyQt6-Desktop-App/1.0'
         })
 
+        # Small executor so independent GETs run in parallel over pooled connections
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="api-client")
+
+        # Last ETag and decoded body per GET URL, for If-None-Match revalidation
+        self._etag_cache: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+
+        # GETs currently on the wire, so concurrent callers share one request
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+
     def _make_request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
-        """Make HTTP request with error handling"""
+        """Make HTTP request, sharing one in-flight request between identical GETs"""
         url = f"{self.base_url}{endpoint}"
+        if method == 'GET':
+            return self._single_flight(url, self._send_request, method, url, **kwargs)
+        return self._send_request(method, url, **kwargs)
+
+    def _single_flight(self, key: str, fn, *args, **kwargs) -> Any:
+        """Run fn once for concurrent callers with the same key; the others wait for its result"""
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = Future()
+                self._inflight[key] = future
+
+        if not is_leader:
+            return future.result()
 
         try:
-            response = self.session.request(method, url, timeout=self.timeout, **kwargs)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            raise APIException(f"API request failed: {str(e)}")
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
+
+    def _send_request(self, method: str, url: str, **kwargs) -> Dict[str, Any]:
+        """Send HTTP request with error handling and jittered retries"""
+        cached = self._etag_cache.get(url) if method == 'GET' else None
+        if cached:
+            kwargs['headers'] = {**kwargs.get('headers', {}), 'If-None-Match': cached[0]}
+
+        # Only retry requests that are safe to send twice
+        retries = self.max_retries if method in self.IDEMPOTENT_METHODS else 0
+
+        for attempt in range(retries + 1):
+            try:
+                response = self.session.request(method, url, timeout=self.timeout, **kwargs)
+                response.raise_for_status()
+
+                # Unchanged on the server: reuse the body decoded last time
+                if response.status_code == 304 and cached:
+                    return cached[1]
+
+                result = orjson.loads(response.content)
+                etag = response.headers.get('ETag')
+                if method == 'GET' and etag:
+                    self._etag_cache[url] = (etag, result)
+                return result
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                error, status_code = e, None
+            except requests.exceptions.HTTPError as e:
+                error, status_code = e, e.response.status_code
+                if status_code not in self.RETRY_STATUSES:
+                    raise APIException(f"API request failed: {str(e)}", status_code)
+            except requests.exceptions.RequestException as e:
+                raise APIException(f"API request failed: {str(e)}")
+            except orjson.JSONDecodeError as e:
+                raise APIException(f"Invalid JSON response: {str(e)}")
+
+            if attempt < retries:
+                # Full jitter: sleep a random time up to the exponential backoff bound
+                backoff = min(self.backoff_max, self.backoff_factor * (2 ** attempt))
+                time.sleep(random.uniform(0, backoff))
+
+        raise APIException(f"API request failed: {str(error)}", status_code)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=128)
+    def _encode_text_body(items: Tuple[Tuple[str, str], ...]) -> bytes:
+        """Encode a body of string fields, reusing the bytes for repeated identical bodies"""
+        # Only str values are cached: 1, 1.0 and True compare equal and would share a slot
+        return orjson.dumps(dict(items))
+
+    @staticmethod
+    @functools.lru_cache(maxsize=64)
+    def _users_path(limit: int, offset: int) -> str:
+        """Build the /users path once per page shape; polling reuses the same one"""
+        return f'/users?limit={limit}&offset={offset}'
 
     def get_users(self, limit=100, offset=0) -> Dict[str, Any]:
         """Get users with pagination"""
-        return self._make_request('GET', f'/users?limit={limit}&offset={offset}')
+        return self._make_request('GET', self._users_path(limit, offset))
 
     def get_user(self, user_id: int) -> Dict[str, Any]:
         """Get specific user by ID"""
@@ -68,7 +164,7 @@ class APIClient:
     def create_user(self, name: str, email: str) -> Dict[str, Any]:
         """Create new user"""
         data = {"name": name, "email": email}
-        return self._make_request('POST', '/users', json=data)
+        return self._make_request('POST', '/users', data=self._encode_text_body(tuple(data.items())))
 
     def update_user(self, user_id: int, name: str = None, email: str = None) -> Dict[str, Any]:
         """Update user"""
@@ -77,7 +173,7 @@ class APIClient:
             data["name"] = name
         if email:
             data["email"] = email
-        return self._make_request('PUT', f'/users/{user_id}', json=data)
+        return self._make_request('PUT', f'/users/{user_id}', data=self._encode_text_body(tuple(data.items())))
 
     def delete_user(self, user_id: int) -> Dict[str, Any]:
         """Delete user"""
@@ -88,7 +184,7 @@ class APIClient:
         data = {"query": query, "allow_write": True}
         if params:
             data["params"] = params
-        return self._make_request('POST', '/query', json=data)
+        return self._make_request('POST', '/query', data=orjson.dumps(data))
 
     def get_stats(self) -> Dict[str, Any]:
         """Get database statistics"""
@@ -98,56 +194,96 @@ class APIClient:
         """Get connection pool statistics"""
         return self._make_request('GET', '/pool-stats')
 
+    def submit(self, fn, *args, **kwargs) -> Future:
+        """Run an API call on the client's thread pool"""
+        return self._executor.submit(fn, *args, **kwargs)
+
+    def get_all_stats(self) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Get database and connection pool statistics concurrently"""
+        db_future = self.submit(self.get_stats)
+        pool_future = self.submit(self.get_pool_stats)
+        return db_future.result(), pool_future.result()
+
     def health_check(self) -> Dict[str, Any]:
         """Check API health"""
         return self._make_request('GET', '/health')
 
+    def close(self) -> None:
+        """Release pooled connections and worker threads"""
+        self._executor.shutdown(wait=False)
+        self.session.close()
+
 
 class APIException(Exception):
     """Custom exception for API errors"""
-    pass
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
 
 
 class DataCache:
     """Simple cache for API responses with TTL"""
 
     def __init__(self, default_ttl=30):
-        self.cache = {}
+        # Copy-on-write: writers rebind a new dict under the lock, readers never lock
+        self._cache = {}
         self.default_ttl = default_ttl
-        self.mutex = QMutex()
+        self._write_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._cache)
 
     def get(self, key: str) -> Optional[Any]:
         """Get cached data if not expired"""
-        with QMutexLocker(self.mutex):
-            if key in self.cache:
-                data, expires_at = self.cache[key]
-                if datetime.now() < expires_at:
-                    return data
-                else:
-                    del self.cache[key]
-            return None
-
-    def set(self, key: str, data: Any, ttl: int = None) -> None:
-        """Cache data with TTL"""
+        data, is_stale = self.get_with_staleness(key)
+        return None if is_stale else data
+
+    def get_with_staleness(self, key: str) -> Tuple[Optional[Any], bool]:
+        """Get cached data and whether it is past its TTL but still within its stale window"""
+        # Misses and fresh hits, the AutoFetchWorker's common case, are a single
+        # lock-free dict lookup plus one clock read
+        entry = self._cache.get(key)
+        if entry is None:
+            return None, False
+        now = time.monotonic()
+        if now < entry[1]:
+            return entry[0], False
+        if now < entry[2]:
+            return entry[0], True
+
+        with self._write_lock:
+            if self._cache.get(key) is entry:
+                cache = dict(self._cache)
+                del cache[key]
+                self._cache = cache
+        return None, False
+
+    def set(self, key: str, data: Any, ttl: int = None, stale_ttl: int = 0) -> None:
+        """Cache data with TTL, optionally kept for stale_ttl more seconds as stale"""
         if ttl is None:
             ttl = self.default_ttl
 
-        expires_at = datetime.now() + timedelta(seconds=ttl)
-        with QMutexLocker(self.mutex):
-            self.cache[key] = (data, expires_at)
+        fresh_until = time.monotonic() + ttl
+        entry = (data, fresh_until, fresh_until + stale_ttl)
+        with self._write_lock:
+            cache = dict(self._cache)
+            cache[key] = entry
+            self._cache = cache
 
     def clear(self) -> None:
         """Clear all cached data"""
-        with QMutexLocker(self.mutex):
-            self.cache.clear()
+        with self._write_lock:
+            self._cache = {}
 
 
 class AutoFetchWorker(QObject):
-    """Worker thread for auto-fetching data from API"""
+    """Schedules auto-fetches on the GUI event loop and runs the API calls on a thread pool"""
 
     data_updated = pyqtSignal(dict)
     error_occurred = pyqtSignal(str)
     status_changed = pyqtSignal(str)
+    fetch_finished = pyqtSignal(object)
 
     def __init__(self, api_client: APIClient, cache: DataCache):
         super().__init__()
@@ -157,9 +293,25 @@ class AutoFetchWorker(QObject):
         self.fetch_interval = 15  # seconds
         self.last_fetch_time = None
 
+        # Serve cached data for cache_ttl seconds, then show it as stale for up
+        # to stale_ttl more seconds while a fresh copy is fetched
+        self.cache_ttl = 25
+        self.stale_ttl = 35
+
         # Add jitter to prevent thundering herd
         self.jitter_range = 5  # ±5 seconds
 
+        # Reusable timer for scheduling the next fetch
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.fetch_data)
+
+        # Completed requests come back from the pool thread through this signal
+        self.fetch_finished.connect(self._on_fetch_finished)
+        self._fetch_in_progress = False
+        self._stale_data = None
+        self._fetch_started = 0.0
+
     def start_fetching(self):
         """Start auto-fetch process"""
         self.is_running = True
@@ -168,40 +320,62 @@ class AutoFetchWorker(QObject):
     def stop_fetching(self):
         """Stop auto-fetch process"""
         self.is_running = False
+        self._timer.stop()
 
     def set_interval(self, seconds: int):
         """Set fetch interval"""
         self.fetch_interval = max(5, seconds)  # Minimum 5 seconds
 
+    @pyqtSlot()
     def fetch_data(self):
-        """Fetch data from API with caching and error handling"""
+        """Serve data from cache, or start an API fetch on the client's thread pool"""
         if not self.is_running:
             return
 
-        try:
-            self.status_changed.emit("Fetching data...")
+        # A fetch is already on the wire; its result will be delivered shortly
+        if self._fetch_in_progress:
+            return
 
-            # Check cache first
-            cache_key = "users_data"
-            cached_data = self.cache.get(cache_key)
+        self.status_changed.emit("Fetching data...")
 
-            if cached_data:
-                self.data_updated.emit(cached_data)
-                self.status_changed.emit("Data loaded from cache")
-            else:
-                # Fetch from API
-                start_time = time.time()
-                result = self.api_client.get_users(limit=1000)
-                fetch_time = time.time() - start_time
+        # Check cache first
+        cache_key = "users_data"
+        cached_data, is_stale = self.cache.get_with_staleness(cache_key)
+
+        if cached_data and not is_stale:
+            self.data_updated.emit(cached_data)
+            self.status_changed.emit("Data loaded from cache")
+            self._schedule_next_fetch()
+            return
+
+        # Show stale data right away, then revalidate
+        if cached_data:
+            self.data_updated.emit(cached_data)
+            self.status_changed.emit("Showing cached data, refreshing...")
 
-                # Cache the result
-                self.cache.set(cache_key, result, ttl=30)
+        self._fetch_in_progress = True
+        self._stale_data = cached_data
+        self._fetch_started = time.time()
+        future = self.api_client.submit(self.api_client.get_users, limit=1000)
+        future.add_done_callback(self.fetch_finished.emit)
+
+    @pyqtSlot(object)
+    def _on_fetch_finished(self, future):
+        """Handle a completed API fetch on the GUI thread"""
+        try:
+            result = future.result()
+            fetch_time = time.time() - self._fetch_started
 
-                # Emit data
+            # Cache the result
+            self.cache.set("users_data", result, ttl=self.cache_ttl, stale_ttl=self.stale_ttl)
+
+            # Emit data, unless it only confirms the stale copy already shown
+            stale_data = self._stale_data
+            if not stale_data or result.get('data') != stale_data.get('data'):
                 self.data_updated.emit(result)
-                self.status_changed.emit(f"Data fetched in {fetch_time:.2f}s")
+            self.status_changed.emit(f"Data fetched in {fetch_time:.2f}s")
 
-                self.last_fetch_time = datetime.now()
+            self.last_fetch_time = datetime.now()
 
         except APIException as e:
             error_msg = f"API Error: {str(e)}"
@@ -213,11 +387,127 @@ class AutoFetchWorker(QObject):
             self.error_occurred.emit(error_msg)
             self.status_changed.emit("Error occurred")
 
-        # Schedule next fetch with jitter
+        self._fetch_in_progress = False
+        self._stale_data = None
+        self._schedule_next_fetch()
+
+    def _schedule_next_fetch(self):
+        """Schedule next fetch with jitter"""
         if self.is_running:
             jitter = random.randint(-self.jitter_range, self.jitter_range)
             next_interval = max(5, self.fetch_interval + jitter)
-            QTimer.singleShot(next_interval * 1000, self.fetch_data)
+            self._timer.start(next_interval * 1000)
+
+
+def _row_changed(old, new):
+    """Compare two user records, treating values of different types as changed"""
+    # == alone misses True -> 1 or 1 -> 1.0, which display differently
+    return old != new or any(type(old[key]) is not type(value) for key, value in new.items())
+
+
+class UserTableModel(QAbstractTableModel):
+    """Table model over API user records, formatting cells only when the view asks"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._columns = ()
+        self._rows = []
+
+        # Ids of the users currently shown, to tell new rows from reordered ones
+        self._row_ids = set()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._columns)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole or not index.isValid():
+            return None
+        value = self._rows[index.row()][self._columns[index.column()]]
+        # Strings and ints go to Qt as-is; the delegate formats ints in C++
+        value_type = type(value)
+        if value_type is str or value_type is int:
+            return value
+        return str(value)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self._columns[section]
+        return super().headerData(section, orientation, role)
+
+    def set_users(self, users):
+        """Show a new list of users, patching rows in place when the columns are unchanged"""
+        columns = tuple(users[0].keys()) if users else self._columns
+        if columns != self._columns or 'id' not in columns:
+            self._reset(users, columns)
+        else:
+            self._patch(users)
+
+    def _reset(self, users, columns):
+        """Replace all rows, used when the column set changes"""
+        self.beginResetModel()
+        self._columns = columns
+        self._rows = list(users)
+        self._row_ids = {user.get('id') for user in users}
+        self.endResetModel()
+
+    def _patch(self, users):
+        """Apply only the rows that were added, removed or changed since the last update"""
+        # Same users in the same order: swap changed rows in, no structural changes
+        if len(users) == len(self._rows) and all(
+            old['id'] == new['id'] for old, new in zip(self._rows, users)
+        ):
+            self._update_in_place(users)
+            return
+
+        new_ids = {user['id'] for user in users}
+
+        # Drop rows whose users disappeared, bottom-up so row indices stay valid
+        for row in range(len(self._rows) - 1, -1, -1):
+            user_id = self._rows[row]['id']
+            if user_id not in new_ids:
+                self.beginRemoveRows(QModelIndex(), row, row)
+                del self._rows[row]
+                self._row_ids.discard(user_id)
+                self.endRemoveRows()
+
+        last_col = len(self._columns) - 1
+        for row, user in enumerate(users):
+            user_id = user['id']
+
+            if row < len(self._rows) and self._rows[row]['id'] == user_id:
+                if not _row_changed(self._rows[row], user):
+                    continue
+                self._rows[row] = user
+                self.dataChanged.emit(self.index(row, 0), self.index(row, last_col))
+            elif user_id not in self._row_ids:
+                self.beginInsertRows(QModelIndex(), row, row)
+                self._rows.insert(row, user)
+                self.endInsertRows()
+            else:
+                # Rows were reordered, positions can no longer be patched in place
+                self._reset(users, self._columns)
+                return
+
+            self._row_ids.add(user_id)
+
+    def _update_in_place(self, users):
+        """Replace changed rows and announce them with one dataChanged signal"""
+        first_changed = last_changed = None
+        for row, user in enumerate(users):
+            if _row_changed(self._rows[row], user):
+                self._rows[row] = user
+                if first_changed is None:
+                    first_changed = row
+                last_changed = row
+
+        if first_changed is not None:
+            self.dataChanged.emit(
+                self.index(first_changed, 0),
+                self.index(last_changed, len(self._columns) - 1)
+            )
 
 
 class UserManagementWidget(QWidget):
@@ -343,12 +633,16 @@ class UserManagementWidget(QWidget):
 class MainWindow(QMainWindow):
     """Main application window"""
 
+    stats_loaded = pyqtSignal(object)
+
     def __init__(self):
         super().__init__()
         self.api_client = APIClient()
         self.cache = DataCache(default_ttl=30)
-        self.auto_fetch_thread = None
+        self._io_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="gui-io")
+        self.stats_loaded.connect(self.show_stats)
         self.auto_fetch_worker = None
+        self._last_col_count = 0
 
         self.init_ui()
         self.setup_auto_fetch()
@@ -374,8 +668,12 @@ class MainWindow(QMainWindow):
         tab_widget = QTabWidget()
 
         # Data table tab
-        self.table_widget = QTableWidget()
-        tab_widget.addTab(self.table_widget, "User Data")
+        self.user_model = UserTableModel(self)
+        self.table_view = QTableView()
+        self.table_view.setModel(self.user_model)
+        # C locale so the delegate renders ids as 1234, not 1,234
+        self.table_view.setLocale(QLocale.c())
+        tab_widget.addTab(self.table_view, "User Data")
 
         # User management tab
         self.user_mgmt_widget = UserManagementWidget(self.api_client)
@@ -441,26 +739,22 @@ class MainWindow(QMainWindow):
         layout.addWidget(self.stats_text)
 
         # Refresh stats button
-        refresh_btn = QPushButton("Refresh Statistics")
-        refresh_btn.clicked.connect(self.refresh_stats)
-        layout.addWidget(refresh_btn)
+        self.refresh_stats_btn = QPushButton("Refresh Statistics")
+        self.refresh_stats_btn.clicked.connect(self.refresh_stats)
+        layout.addWidget(self.refresh_stats_btn)
 
         widget.setLayout(layout)
         return widget
 
     def setup_auto_fetch(self):
-        """Setup auto-fetch worker thread"""
-        self.auto_fetch_thread = QThread()
+        """Setup auto-fetch worker"""
         self.auto_fetch_worker = AutoFetchWorker(self.api_client, self.cache)
-        self.auto_fetch_worker.moveToThread(self.auto_fetch_thread)
 
         # Connect signals
         self.auto_fetch_worker.data_updated.connect(self.update_table)
         self.auto_fetch_worker.error_occurred.connect(self.handle_error)
         self.auto_fetch_worker.status_changed.connect(self.statusBar().showMessage)
 
-        self.auto_fetch_thread.start()
-
         # Start auto-fetch if enabled
         if self.auto_fetch_checkbox.isChecked():
             self.auto_fetch_worker.start_fetching()
@@ -496,20 +790,18 @@ class MainWindow(QMainWindow):
 
         users = data['data']
 
-        # Setup table
-        self.table_widget.setRowCount(len(users))
-        if users:
-            self.table_widget.setColumnCount(len(users[0]))
-            self.table_widget.setHorizontalHeaderLabels(users[0].keys())
-
-        # Populate data
-        for row, user in enumerate(users):
-            for col, (key, value) in enumerate(user.items()):
-                item = QTableWidgetItem(str(value))
-                self.table_widget.setItem(row, col, item)
+        # Batch repaints while the model applies row changes
+        self.table_view.setUpdatesEnabled(False)
+        try:
+            self.user_model.set_users(users)
+        finally:
+            self.table_view.setUpdatesEnabled(True)
 
-        # Auto-resize columns
-        self.table_widget.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        # Size columns once per layout change instead of on every update
+        col_count = self.user_model.columnCount()
+        if col_count != self._last_col_count:
+            self.table_view.resizeColumnsToContents()
+            self._last_col_count = col_count
 
         # Update status
         exec_time = data.get('execution_time', 0)
@@ -532,26 +824,36 @@ class MainWindow(QMainWindow):
             )
 
     def refresh_stats(self):
-        """Refresh statistics display"""
+        """Refresh statistics display without blocking the GUI thread"""
+        self.refresh_stats_btn.setEnabled(False)
+        future = self._io_pool.submit(self.api_client.get_all_stats)
+        # Emitted from the pool thread, delivered to show_stats on the GUI thread
+        future.add_done_callback(self.stats_loaded.emit)
+
+    @pyqtSlot(object)
+    def show_stats(self, future):
+        """Display statistics fetched by refresh_stats"""
+        self.refresh_stats_btn.setEnabled(True)
         try:
-            db_stats = self.api_client.get_stats()
-            pool_stats = self.api_client.get_pool_stats()
+            db_stats, pool_stats = future.result()
 
-            stats_text = "=== Database Statistics ===\n"
-            for key, value in db_stats.items():
-                stats_text += f"{key}: {value}\n"
+            lines = ["=== Database Statistics ==="]
+            lines.extend(f"{key}: {value}" for key, value in db_stats.items())
 
-            stats_text += "\n=== Connection Pool Statistics ===\n"
-            for key, value in pool_stats.items():
-                if isinstance(value, float):
-                    stats_text += f"{key}: {value:.2f}\n"
-                else:
-                    stats_text += f"{key}: {value}\n"
+            lines.append("")
+            lines.append("=== Connection Pool Statistics ===")
+            lines.extend(
+                f"{key}: {value:.2f}" if isinstance(value, float) else f"{key}: {value}"
+                for key, value in pool_stats.items()
+            )
 
-            stats_text += f"\n=== Cache Statistics ===\n"
-            stats_text += f"cached_items: {len(self.cache.cache)}\n"
+            lines.append("")
+            lines.append("=== Cache Statistics ===")
+            lines.append(f"cached_items: {len(self.cache)}")
+            lines.append("")
 
-            self.stats_text.setText(stats_text)
+            # Plain text skips QTextEdit's rich-text detection
+            self.stats_text.setPlainText("\n".join(lines))
 
         except APIException as e:
             QMessageBox.warning(self, "Error", f"Failed to get statistics: {str(e)}")
@@ -561,10 +863,8 @@ class MainWindow(QMainWindow):
         if self.auto_fetch_worker:
             self.auto_fetch_worker.stop_fetching()
 
-        if self.auto_fetch_thread:
-            self.auto_fetch_thread.quit()
-            self.auto_fetch_thread.wait()
-
+        self._io_pool.shutdown(wait=False)
+        self.api_client.close()
         event.accept()
 
 
@@ -0,0 +1,21 @@
+"""Gunicorn settings for serving the SQLite APIs, e.g. gunicorn optimized:app"""
+import os
+import sys
+
+bind = "0.0.0.0:5000"
+workers = os.cpu_count() or 1
+
+# sqlite3 blocks inside C with the GIL released, so OS threads overlap those
+# waits; under gevent a busy_timeout wait would stall every greenlet in the worker
+worker_class = "gthread"
+threads = 16  # requests beyond the connection pool size wait on the pool's Condition
+
+# The app is imported per worker: SQLite connections must not cross a fork
+preload_app = False
+accesslog = None
+
+def worker_exit(server, worker):
+    """Close the worker's database connections on shutdown"""
+    module = sys.modules.get(server.app.app_uri.split(':')[0])
+    if module is not None and hasattr(module, 'db_manager'):
+        module.db_manager.close_all_connections()
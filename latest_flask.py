@@ -3,10 +3,12 @@ import threading
 import time
 import json
 import re
+from collections import OrderedDict
 from contextlib import contextmanager
-from flask import Flask, request, jsonify
+from flask import Flask, request
 from functools import wraps
 import logging
+import orjson
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -15,25 +17,48 @@ logger = logging.getLogger(__name__)
 class SQLiteManager:
     """Thread-safe SQLite database manager with connection pooling"""
     
-    def __init__(self, db_path, max_connections=25, timeout=60, max_retries=5):
+    def __init__(self, db_path, max_connections=25, timeout=60, result_cache_size=512, result_cache_ttl=1.0):
         self.db_path = db_path
         self.max_connections = max_connections
         self.timeout = timeout
-        self.max_retries = max_retries
+        self.result_cache_size = result_cache_size
+        self.result_cache_ttl = result_cache_ttl
         self._local = threading.local()
-        self._lock = threading.RLock()
-        self._connections = []
+        self._lock = threading.Lock()
+        # Signalled whenever a connection is returned, so waiters wake immediately
+        self._connection_available = threading.Condition(self._lock)
+        self._connections = set()
         self._available_connections = []
         self._connection_count = 0
         self._active_connections = 0
         
-        # Performance monitoring
+        # Performance monitoring; a separate lock keeps counting off the pool lock
+        self._count_lock = threading.Lock()
         self._request_count = 0
         self._error_count = 0
         self._start_time = time.time()
         
+        # LRU of recent SELECT results keyed by (query, params, format); any
+        # committed write bumps _write_version and empties it
+        self._result_cache = OrderedDict()
+        self._result_cache_lock = threading.Lock()
+        self._write_version = 0
+        
         # Initialize database and create sample table
         self._init_database()
+        
+        # SQLite serializes writers anyway, so all writes share one dedicated
+        # connection and the pool is left to readers
+        self._writer_lock = threading.Lock()
+        self._writer_conn = self._open_conn()
+        
+        # Open the whole read pool up front so early requests don't pay for
+        # connect + PRAGMA setup; _get_connection still opens lazily after a close
+        for _ in range(self.max_connections):
+            conn = self._open_conn()
+            self._connections.add(conn)
+            self._available_connections.append(conn)
+        self._connection_count = len(self._connections)
     
     def _init_database(self):
         """Initialize database with proper settings for high concurrency"""
@@ -78,44 +103,79 @@ class SQLiteManager:
             if conn:
                 self._return_connection(conn)
     
+    @contextmanager
+    def get_writer_connection(self):
+        """Get the writer connection inside a BEGIN IMMEDIATE transaction"""
+        with self._writer_lock:
+            conn = self._writer_conn
+            # Take the write lock up front rather than failing mid-transaction
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                conn.execute("COMMIT")
+            except Exception:
+                # A failed COMMIT (e.g. a deferred constraint) leaves the transaction
+                # open; SQLite may also have rolled back on its own already
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
+            self._invalidate_result_cache()
+    
+    def _invalidate_result_cache(self):
+        """Drop cached SELECT results after a write"""
+        with self._result_cache_lock:
+            self._write_version += 1
+            self._result_cache.clear()
+    
+    def _open_conn(self):
+        """Open a new connection with the per-connection settings applied"""
+        # sqlite3 keeps an LRU of prepared statements per connection keyed by
+        # SQL text, so repeated queries skip parsing and planning. Autocommit
+        # mode skips pysqlite's implicit BEGIN handling; transactions are explicit
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.timeout,
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=256
+        )
+        
+        # Optimized connection settings for high concurrency, applied in one call.
+        # Reads go through a 1GB mmap window and a 64MB page cache (negative = KiB)
+        conn.executescript("""
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            PRAGMA busy_timeout=60000;
+            PRAGMA mmap_size=1073741824;
+            PRAGMA cache_size=-65536;
+            PRAGMA temp_store=MEMORY;
+        """)
+        return conn
+    
     def _get_connection(self):
         """Get a connection from the pool or create a new one"""
+        deadline = time.monotonic() + self.timeout
+        
         with self._lock:
-            if self._available_connections:
-                conn = self._available_connections.pop()
-                self._active_connections += 1
-                return conn
-            
-            if self._connection_count < self.max_connections:
-                conn = sqlite3.connect(
-                    self.db_path,
-                    timeout=self.timeout,
-                    check_same_thread=False
-                )
-                conn.row_factory = sqlite3.Row
-                
-                # Optimized connection settings for high concurrency
-                conn.execute("PRAGMA journal_mode=WAL")
-                conn.execute("PRAGMA synchronous=NORMAL")
-                conn.execute("PRAGMA busy_timeout=60000")  # 60 seconds
-                conn.execute("PRAGMA cache_size=2000")  # 2MB per connection
-                conn.execute("PRAGMA temp_store=memory")
-                
-                self._connections.append(conn)
-                self._connection_count += 1
-                self._active_connections += 1
-                return conn
-            
-            # Wait for available connection with better timeout handling
-            start_time = time.time()
-            while time.time() - start_time < self.timeout:
+            while True:
                 if self._available_connections:
                     conn = self._available_connections.pop()
                     self._active_connections += 1
                     return conn
-                time.sleep(0.05)  # Shorter sleep for better responsiveness
+                
+                if self._connection_count < self.max_connections:
+                    break
+                
+                # Wait for a connection to be returned instead of polling
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._connection_available.wait(remaining):
+                    raise Exception(f"Connection pool exhausted. Active: {self._active_connections}, Max: {self.max_connections}")
             
-            raise Exception(f"Connection pool exhausted. Active: {self._active_connections}, Max: {self.max_connections}")
+            conn = self._open_conn()
+            self._connections.add(conn)
+            self._connection_count += 1
+            self._active_connections += 1
+            return conn
     
     def _return_connection(self, conn):
         """Return connection to the pool"""
@@ -126,75 +186,117 @@ class SQLiteManager:
             else:
                 conn.close()
                 if conn in self._connections:
-                    self._connections.remove(conn)
+                    self._connections.discard(conn)
                     self._connection_count -= 1
+            # Either a pooled connection or a free slot is now available
+            self._connection_available.notify()
     
-    def execute_select_query(self, query, params=None):
-        """Execute SELECT query with retry logic and performance monitoring"""
-        return self._execute_query_with_retry(query, params, operation_type="SELECT")
+    def execute_select_query(self, query, params=None, columnar=False):
+        """Execute SELECT query, serving repeats from the result cache"""
+        try:
+            # Tag values with their type: 1, 1.0 and True compare equal but bind differently
+            if isinstance(params, dict):
+                frozen = tuple(sorted((name, type(value), value) for name, value in params.items()))
+            else:
+                frozen = tuple((type(value), value) for value in params or ())
+            key = (query, frozen, columnar)
+            hash(key)
+        except TypeError:
+            return self._execute_query(query, params, operation_type="SELECT", columnar=columnar)
+        
+        now = time.monotonic()
+        with self._result_cache_lock:
+            entry = self._result_cache.get(key)
+            if entry is not None and now - entry[0] < self.result_cache_ttl:
+                self._result_cache.move_to_end(key)
+                return {**entry[1], "cached": True}
+            version = self._write_version
+        
+        result = self._execute_query(query, params, operation_type="SELECT", columnar=columnar)
+        
+        with self._result_cache_lock:
+            # A write committed while the query ran may make the result stale
+            if version == self._write_version:
+                self._result_cache[key] = (now, result)
+                self._result_cache.move_to_end(key)
+                if len(self._result_cache) > self.result_cache_size:
+                    self._result_cache.popitem(last=False)
+        return result
     
     def execute_insert_query(self, query, params=None):
-        """Execute INSERT query with retry logic and performance monitoring"""
-        return self._execute_query_with_retry(query, params, operation_type="INSERT")
+        """Execute INSERT query with performance monitoring"""
+        return self._execute_query(query, params, operation_type="INSERT")
     
     def execute_update_query(self, query, params=None):
-        """Execute UPDATE/DELETE query with retry logic and performance monitoring"""
-        return self._execute_query_with_retry(query, params, operation_type="UPDATE")
-    
-    def _execute_query_with_retry(self, query, params=None, operation_type="SELECT"):
-        """Execute a query with retry logic and performance monitoring"""
-        retry_delay = 0.05
+        """Execute UPDATE/DELETE query with performance monitoring"""
+        return self._execute_query(query, params, operation_type="UPDATE")
+    
+    def _execute_query(self, query, params=None, operation_type="SELECT", columnar=False):
+        """Execute a query with performance monitoring"""
+        # Reads come from the pool; writes go through the single writer connection.
+        # Lock contention is waited out inside SQLite by busy_timeout, so there is
+        # no Python-side retry loop
+        connection = self.get_connection if operation_type == "SELECT" else self.get_writer_connection
         
-        for attempt in range(self.max_retries):
-            try:
-                with self.get_connection() as conn:
-                    cursor = conn.cursor()
-                    
-                    start_time = time.time()
-                    
-                    if params:
-                        cursor.execute(query, params)
-                    else:
-                        cursor.execute(query)
-                    
-                    execution_time = time.time() - start_time
-                    
-                    # Log slow queries (>1 second)
-                    if execution_time > 1.0:
-                        logger.warning(f"Slow query detected: {execution_time:.2f}s - {query[:100]}...")
-                    
+        try:
+            with connection() as conn:
+                cursor = conn.cursor()
+                
+                start_time = time.time()
+                
+                if params:
+                    cursor.execute(query, params)
+                else:
+                    cursor.execute(query)
+                
+                execution_time = time.time() - start_time
+                
+                # Log slow queries (>1 second)
+                if execution_time > 1.0:
+                    logger.warning("Slow query detected: %.2fs - %.100s...", execution_time, query)
+                
+                with self._count_lock:
                     self._request_count += 1
-                    
-                    if operation_type == "SELECT":
-                        result = [dict(row) for row in cursor.fetchall()]
+                
+                if operation_type == "SELECT":
+                    cols = [d[0] for d in cursor.description]
+                    if columnar:
+                        # Column names once, rows as the raw tuples; no per-row dicts
+                        rows = cursor.fetchall()
                         return {
-                            "data": result,
-                            "rowcount": len(result),
+                            "columns": cols,
+                            "rows": rows,
+                            "rowcount": len(rows),
                             "execution_time": execution_time,
                             "operation": "SELECT"
                         }
-                    else:
-                        conn.commit()
-                        return {
-                            "data": None,
-                            "rowcount": cursor.rowcount,
-                            "lastrowid": cursor.lastrowid,
-                            "execution_time": execution_time,
-                            "operation": operation_type
-                        }
-                        
-            except sqlite3.OperationalError as e:
-                error_msg = str(e).lower()
-                if ("database is locked" in error_msg or "busy" in error_msg) and attempt < self.max_retries - 1:
-                    logger.warning(f"Database busy, retrying... (attempt {attempt + 1}/{self.max_retries})")
-                    time.sleep(retry_delay * (2 ** attempt))  # Exponential backoff
-                    continue
+                    # Zip plain tuples against the column names once per query
+                    # rather than allocating a sqlite3.Row per row
+                    result = [dict(zip(cols, row)) for row in cursor.fetchall()]
+                    return {
+                        "data": result,
+                        "rowcount": len(result),
+                        "execution_time": execution_time,
+                        "operation": "SELECT"
+                    }
+                else:
+                    return {
+                        "data": None,
+                        "rowcount": cursor.rowcount,
+                        "lastrowid": cursor.lastrowid,
+                        "execution_time": execution_time,
+                        "operation": operation_type
+                    }
+                    
+        except sqlite3.OperationalError as e:
+            with self._count_lock:
                 self._error_count += 1
-                raise e
-            except Exception as e:
+            raise e
+        except Exception as e:
+            with self._count_lock:
                 self._error_count += 1
-                logger.error(f"Database error: {str(e)}")
-                raise e
+            logger.error("Database error: %s", e)
+            raise e
     
     def get_pool_stats(self):
         """Get connection pool statistics"""
@@ -215,48 +317,149 @@ class SQLiteManager:
     def close_all_connections(self):
         """Close all connections in the pool"""
         with self._lock:
-            for conn in self._connections + self._available_connections:
+            # Every pooled connection, idle or not, is tracked in _connections
+            for conn in self._connections:
                 try:
                     conn.close()
-                except:
+                except sqlite3.Error:
                     pass
             self._connections.clear()
             self._available_connections.clear()
             self._connection_count = 0
             self._active_connections = 0
+        
+        with self._writer_lock:
+            try:
+                self._writer_conn.close()
+            except sqlite3.Error:
+                pass
 
 # Initialize Flask app and database manager
 app = Flask(__name__)
-app.config['JSON_SORT_KEYS'] = False
 
 # Initialize database manager with optimized settings for your load
-db_manager = SQLiteManager('app.db', max_connections=25, timeout=60, max_retries=5)
+db_manager = SQLiteManager('app.db', max_connections=25, timeout=60)
+
+def _json(payload, status=200):
+    """Build a JSON response with orjson instead of Flask's stdlib encoder"""
+    # orjson emits compact, unsorted output; Werkzeug derives Content-Length from the bytes body
+    return app.response_class(orjson.dumps(payload), status=status, mimetype='application/json')
+
+# Static response bodies, serialized once at import
+_HEALTH_TEMPLATE = b'{"status":"healthy","timestamp":%f}'
+_ERROR_BODIES = {
+    "query_required": orjson.dumps({"error": "Query is required"}),
+    "queries_required": orjson.dumps({"error": "Queries array is required"}),
+    "empty_batch": orjson.dumps({"error": "At least one query is required"}),
+}
+
+def _load_body():
+    """Parse the request body with orjson, returning None if it is not valid JSON"""
+    try:
+        return orjson.loads(request.get_data(cache=False))
+    except orjson.JSONDecodeError:
+        return None
+
+def _error(key, status=400):
+    """Build an error response from a pre-serialized body"""
+    return app.response_class(_ERROR_BODIES[key], status=status, mimetype='application/json')
+
+# Query validation patterns, compiled once at import
+_SELECT_PREFIX = re.compile(r'\s*SELECT\b', re.IGNORECASE)
+_INSERT_PREFIX = re.compile(r'\s*INSERT\b', re.IGNORECASE)
+_UPDATE_PREFIX = re.compile(r'\s*(?:UPDATE|DELETE)\b', re.IGNORECASE)
+_SELECT_FORBIDDEN = re.compile(r'\b(?:DROP|DELETE|TRUNCATE|ALTER|CREATE|INSERT|UPDATE)\b', re.IGNORECASE)
+_UPDATE_FORBIDDEN = re.compile(r'\b(?:DROP|TRUNCATE|ALTER|CREATE)\b', re.IGNORECASE)
 
 def validate_query_type(query, expected_type):
     """Validate that the query matches the expected operation type"""
-    query_upper = query.strip().upper()
-    
     if expected_type == "SELECT":
-        if not query_upper.startswith('SELECT'):
+        if not _SELECT_PREFIX.match(query):
             return False, "Only SELECT queries are allowed for this endpoint"
         # Check for dangerous operations in SELECT
-        dangerous_in_select = ['DROP', 'DELETE', 'TRUNCATE', 'ALTER', 'CREATE', 'INSERT', 'UPDATE']
-        if any(keyword in query_upper for keyword in dangerous_in_select):
+        if _SELECT_FORBIDDEN.search(query):
             return False, "SELECT queries cannot contain write operations"
     
     elif expected_type == "INSERT":
-        if not query_upper.startswith('INSERT'):
+        if not _INSERT_PREFIX.match(query):
             return False, "Only INSERT queries are allowed for this endpoint"
     
     elif expected_type == "UPDATE":
-        if not (query_upper.startswith('UPDATE') or query_upper.startswith('DELETE')):
+        if not _UPDATE_PREFIX.match(query):
             return False, "Only UPDATE and DELETE queries are allowed for this endpoint"
         # Additional protection against dangerous operations
-        if any(keyword in query_upper for keyword in ['DROP', 'TRUNCATE', 'ALTER', 'CREATE']):
+        if _UPDATE_FORBIDDEN.search(query):
             return False, "Dangerous operations are not allowed"
     
     return True, "Valid query"
 
+_BATCH_PREFIX = {"INSERT": _INSERT_PREFIX, "UPDATE": _UPDATE_PREFIX}
+
+def find_invalid_query(queries, expected_type):
+    """Return (index, error) for the first query failing validation, or None if all pass"""
+    prefix = _BATCH_PREFIX[expected_type]
+    # Common case: one forbidden-keyword scan over the whole batch plus a prefix
+    # match per query; the record separator keeps word boundaries between queries
+    if all(prefix.match(query) for query in queries) and not (
+        expected_type == "UPDATE" and _UPDATE_FORBIDDEN.search('\x1e'.join(queries))
+    ):
+        return None
+    
+    # Something failed, so locate the offending query for the error message
+    for i, query in enumerate(queries):
+        is_valid, error_msg = validate_query_type(query, expected_type)
+        if not is_valid:
+            return i, error_msg
+    return None
+
+# Single-row INSERT with an explicit column list, eligible for executemany
+_PLAIN_INSERT = re.compile(r'\s*INSERT\s+INTO\s+([\w."`\[\]]+)\s*\(([^()]*)\)\s*VALUES\s*\([^()]*\)\s*;?\s*$', re.IGNORECASE)
+_WITHOUT_ROWID = re.compile(r'\bWITHOUT\s+ROWID\b', re.IGNORECASE)
+_ON_CONFLICT = re.compile(r'\bON\s+CONFLICT\b', re.IGNORECASE)
+_ROWID_NAMES = {'rowid', 'oid', '_rowid_'}
+
+def _unquote(name):
+    """Strip identifier quoting and fold case the way SQLite matches names"""
+    return name.strip().strip('"`[]').lower()
+
+def is_plain_insert(conn, query):
+    """Check that an INSERT adds one row to a rowid table that assigns the rowid itself"""
+    match = _PLAIN_INSERT.match(query)
+    if not match:
+        return False
+    schema, _, table = match.group(1).rpartition('.')
+    schema = _unquote(schema) or 'main'
+    table = _unquote(table)
+    if not schema.isidentifier():
+        return False
+    
+    # Only a plain rowid table without triggers hands out consecutive rowids;
+    # views, virtual and WITHOUT ROWID tables report something else, and
+    # ON CONFLICT IGNORE/REPLACE clauses can skip or replace rows mid-batch
+    row = conn.execute(
+        f"SELECT sql FROM {schema}.sqlite_master WHERE type = 'table' AND lower(name) = ?", (table,)
+    ).fetchone()
+    if row is None or not row[0] or row[0].upper().startswith('CREATE VIRTUAL'):
+        return False
+    if _WITHOUT_ROWID.search(row[0]) or _ON_CONFLICT.search(row[0]):
+        return False
+    if conn.execute(
+        f"SELECT 1 FROM {schema}.sqlite_master WHERE type = 'trigger' AND lower(tbl_name) = ? "
+        "UNION ALL SELECT 1 FROM temp.sqlite_master WHERE type = 'trigger' AND lower(tbl_name) = ?",
+        (table, table)
+    ).fetchone():
+        return False
+    
+    # A lone INTEGER PRIMARY KEY column is an alias for the rowid under its own name
+    info = conn.execute("SELECT name, type, pk FROM pragma_table_info(?, ?)", (table, schema)).fetchall()
+    pk_columns = [(name, col_type) for name, col_type, pk in info if pk]
+    rowid_names = set(_ROWID_NAMES)
+    if len(pk_columns) == 1 and pk_columns[0][1].upper() == 'INTEGER':
+        rowid_names.add(pk_columns[0][0].lower())
+    
+    columns = {_unquote(col) for col in match.group(2).split(',')}
+    return not columns & rowid_names
+
 def handle_db_errors(f):
     """Decorator to handle database errors"""
     @wraps(f)
@@ -264,28 +467,28 @@ def handle_db_errors(f):
         try:
             return f(*args, **kwargs)
         except sqlite3.IntegrityError as e:
-            return jsonify({"error": "Data integrity error", "message": str(e)}), 400
+            return _json({"error": "Data integrity error", "message": str(e)}, 400)
         except sqlite3.OperationalError as e:
-            return jsonify({"error": "Database operation error", "message": str(e)}), 500
+            return _json({"error": "Database operation error", "message": str(e)}, 500)
         except Exception as e:
-            logger.error(f"Unexpected error: {str(e)}")
-            return jsonify({"error": "Internal server error", "message": str(e)}), 500
+            logger.error("Unexpected error: %s", e)
+            return _json({"error": "Internal server error", "message": str(e)}, 500)
     
     return decorated_function
 
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
-    return jsonify({"status": "healthy", "timestamp": time.time()})
+    return app.response_class(_HEALTH_TEMPLATE % time.time(), mimetype='application/json')
 
 @app.route('/select', methods=['POST'])
 @handle_db_errors
 def execute_select():
     """Execute SELECT queries only"""
-    data = request.get_json()
+    data = _load_body()
     
     if not data or 'query' not in data:
-        return jsonify({"error": "Query is required"}), 400
+        return _error("query_required")
     
     query = data['query'].strip()
     params = data.get('params', [])
@@ -293,23 +496,25 @@ def execute_select():
     # Validate query type
     is_valid, error_msg = validate_query_type(query, "SELECT")
     if not is_valid:
-        return jsonify({"error": error_msg}), 400
+        return _json({"error": error_msg}, 400)
     
     try:
-        result = db_manager.execute_select_query(query, params)
-        return jsonify(result)
+        # "format": "columnar" returns {"columns": [...], "rows": [[...], ...]}
+        columnar = data.get('format') == 'columnar'
+        result = db_manager.execute_select_query(query, params, columnar=columnar)
+        return _json(result)
     except Exception as e:
-        logger.error(f"SELECT query error: {str(e)}")
-        return jsonify({"error": "Query execution failed", "message": str(e)}), 500
+        logger.error("SELECT query error: %s", e)
+        return _json({"error": "Query execution failed", "message": str(e)}, 500)
 
 @app.route('/insert', methods=['POST'])
 @handle_db_errors
 def execute_insert():
     """Execute INSERT queries only"""
-    data = request.get_json()
+    data = _load_body()
     
     if not data or 'query' not in data:
-        return jsonify({"error": "Query is required"}), 400
+        return _error("query_required")
     
     query = data['query'].strip()
     params = data.get('params', [])
@@ -317,23 +522,23 @@ def execute_insert():
     # Validate query type
     is_valid, error_msg = validate_query_type(query, "INSERT")
     if not is_valid:
-        return jsonify({"error": error_msg}), 400
+        return _json({"error": error_msg}, 400)
     
     try:
         result = db_manager.execute_insert_query(query, params)
-        return jsonify(result)
+        return _json(result)
     except Exception as e:
-        logger.error(f"INSERT query error: {str(e)}")
-        return jsonify({"error": "Query execution failed", "message": str(e)}), 500
+        logger.error("INSERT query error: %s", e)
+        return _json({"error": "Query execution failed", "message": str(e)}, 500)
 
 @app.route('/update', methods=['POST'])
 @handle_db_errors
 def execute_update():
     """Execute UPDATE and DELETE queries only"""
-    data = request.get_json()
+    data = _load_body()
     
     if not data or 'query' not in data:
-        return jsonify({"error": "Query is required"}), 400
+        return _error("query_required")
     
     query = data['query'].strip()
     params = data.get('params', [])
@@ -341,94 +546,124 @@ def execute_update():
     # Validate query type
     is_valid, error_msg = validate_query_type(query, "UPDATE")
     if not is_valid:
-        return jsonify({"error": error_msg}), 400
+        return _json({"error": error_msg}, 400)
     
     try:
         result = db_manager.execute_update_query(query, params)
-        return jsonify(result)
+        return _json(result)
     except Exception as e:
-        logger.error(f"UPDATE/DELETE query error: {str(e)}")
-        return jsonify({"error": "Query execution failed", "message": str(e)}), 500
+        logger.error("UPDATE/DELETE query error: %s", e)
+        return _json({"error": "Query execution failed", "message": str(e)}, 500)
 
 # Additional utility endpoints
 @app.route('/pool-stats', methods=['GET'])
 def get_pool_stats():
     """Get connection pool statistics and performance metrics"""
-    return jsonify(db_manager.get_pool_stats())
+    return _json(db_manager.get_pool_stats())
+
+# Short-lived cache for /stats so frequent polling doesn't re-run the counts
+STATS_CACHE_TTL = 2.0
+_stats_cache = {'ts': 0.0, 'payload': None}
 
 @app.route('/stats', methods=['GET'])
 @handle_db_errors
 def get_stats():
     """Get database statistics using the select endpoint internally"""
+    if _stats_cache['payload'] is not None and time.monotonic() - _stats_cache['ts'] < STATS_CACHE_TTL:
+        return _json(_stats_cache['payload'])
+    
     try:
-        # Get total users
-        total_users_result = db_manager.execute_select_query("SELECT COUNT(*) as total_users FROM users")
-        total_users = total_users_result['data'][0]['total_users'] if total_users_result['data'] else 0
-        
-        # Get users created today
-        users_today_result = db_manager.execute_select_query(
-            "SELECT COUNT(*) as users_today FROM users WHERE DATE(created_at) = DATE('now')"
+        # Both counts in one pass; COUNT over CASE ignores the NULLs from non-matching rows
+        result = db_manager.execute_select_query(
+            "SELECT COUNT(*) as total_users, "
+            "COUNT(CASE WHEN created_at >= datetime('now', 'start of day') "
+            "AND created_at < datetime('now', 'start of day', '+1 day') THEN 1 END) as users_today "
+            "FROM users"
         )
-        users_today = users_today_result['data'][0]['users_today'] if users_today_result['data'] else 0
+        row = result['data'][0] if result['data'] else {}
+        total_users = row.get('total_users', 0)
+        users_today = row.get('users_today', 0)
         
-        return jsonify({
+        payload = {
             "total_users": total_users,
             "users_today": users_today
-        })
+        }
+        _stats_cache['payload'] = payload
+        _stats_cache['ts'] = time.monotonic()
+        return _json(payload)
     except Exception as e:
-        logger.error(f"Stats query error: {str(e)}")
-        return jsonify({"error": "Failed to get statistics", "message": str(e)}), 500
+        logger.error("Stats query error: %s", e)
+        return _json({"error": "Failed to get statistics", "message": str(e)}, 500)
 
 # Batch operations endpoints
 @app.route('/batch-insert', methods=['POST'])
 @handle_db_errors
 def batch_insert():
     """Execute multiple INSERT queries in a single transaction"""
-    data = request.get_json()
+    data = _load_body()
     
     if not data or 'queries' not in data or not isinstance(data['queries'], list):
-        return jsonify({"error": "Queries array is required"}), 400
+        return _error("queries_required")
     
     queries = data['queries']
     if not queries:
-        return jsonify({"error": "At least one query is required"}), 400
+        return _error("empty_batch")
     
     # Validate all queries first
     for i, query_data in enumerate(queries):
         if 'query' not in query_data:
-            return jsonify({"error": f"Query is required for item {i}"}), 400
-        
-        is_valid, error_msg = validate_query_type(query_data['query'], "INSERT")
-        if not is_valid:
-            return jsonify({"error": f"Invalid query at index {i}: {error_msg}"}), 400
+            return _json({"error": f"Query is required for item {i}"}, 400)
+    
+    invalid = find_invalid_query([q['query'] for q in queries], "INSERT")
+    if invalid:
+        i, error_msg = invalid
+        return _json({"error": f"Invalid query at index {i}: {error_msg}"}, 400)
     
     # Execute all queries in a single transaction
     try:
-        with db_manager.get_connection() as conn:
+        with db_manager.get_writer_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("BEGIN TRANSACTION")
             
             results = []
             start_time = time.time()
             
-            for query_data in queries:
-                query = query_data['query'].strip()
-                params = query_data.get('params', [])
+            i = 0
+            while i < len(queries):
+                # Collect the run of consecutive items sharing the same SQL text
+                query = queries[i]['query'].strip()
+                j = i + 1
+                while j < len(queries) and queries[j]['query'].strip() == query:
+                    j += 1
+                run = queries[i:j]
+                i = j
                 
-                if params:
-                    cursor.execute(query, params)
-                else:
-                    cursor.execute(query)
+                if len(run) > 1 and all(q.get('params') for q in run) and is_plain_insert(conn, query):
+                    # Prepare once and step every row in C; rowids inside the
+                    # write transaction are consecutive, ending at last_insert_rowid()
+                    cursor.executemany(query, [q['params'] for q in run])
+                    last_id = cursor.execute("SELECT last_insert_rowid()").fetchone()[0]
+                    results.extend(
+                        {"rowcount": 1, "lastrowid": rowid}
+                        for rowid in range(last_id - len(run) + 1, last_id + 1)
+                    )
+                    continue
                 
-                results.append({
-                    "rowcount": cursor.rowcount,
-                    "lastrowid": cursor.lastrowid
-                })
+                for query_data in run:
+                    params = query_data.get('params', [])
+                    
+                    if params:
+                        cursor.execute(query, params)
+                    else:
+                        cursor.execute(query)
+                    
+                    results.append({
+                        "rowcount": cursor.rowcount,
+                        "lastrowid": cursor.lastrowid
+                    })
             
-            conn.commit()
             execution_time = time.time() - start_time
             
-            return jsonify({
+            return _json({
                 "message": f"Executed {len(queries)} INSERT queries successfully",
                 "results": results,
                 "execution_time": execution_time,
@@ -436,36 +671,36 @@ def batch_insert():
             })
             
     except Exception as e:
-        logger.error(f"Batch INSERT error: {str(e)}")
-        return jsonify({"error": "Batch insert failed", "message": str(e)}), 500
+        logger.error("Batch INSERT error: %s", e)
+        return _json({"error": "Batch insert failed", "message": str(e)}, 500)
 
 @app.route('/batch-update', methods=['POST'])
 @handle_db_errors
 def batch_update():
     """Execute multiple UPDATE/DELETE queries in a single transaction"""
-    data = request.get_json()
+    data = _load_body()
     
     if not data or 'queries' not in data or not isinstance(data['queries'], list):
-        return jsonify({"error": "Queries array is required"}), 400
+        return _error("queries_required")
     
     queries = data['queries']
     if not queries:
-        return jsonify({"error": "At least one query is required"}), 400
+        return _error("empty_batch")
     
     # Validate all queries first
     for i, query_data in enumerate(queries):
         if 'query' not in query_data:
-            return jsonify({"error": f"Query is required for item {i}"}), 400
-        
-        is_valid, error_msg = validate_query_type(query_data['query'], "UPDATE")
-        if not is_valid:
-            return jsonify({"error": f"Invalid query at index {i}: {error_msg}"}), 400
+            return _json({"error": f"Query is required for item {i}"}, 400)
+    
+    invalid = find_invalid_query([q['query'] for q in queries], "UPDATE")
+    if invalid:
+        i, error_msg = invalid
+        return _json({"error": f"Invalid query at index {i}: {error_msg}"}, 400)
     
     # Execute all queries in a single transaction
     try:
-        with db_manager.get_connection() as conn:
+        with db_manager.get_writer_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("BEGIN TRANSACTION")
             
             results = []
             start_time = time.time()
@@ -483,10 +718,9 @@ def batch_update():
                     "rowcount": cursor.rowcount
                 })
             
-            conn.commit()
             execution_time = time.time() - start_time
             
-            return jsonify({
+            return _json({
                 "message": f"Executed {len(queries)} UPDATE/DELETE queries successfully",
                 "results": results,
                 "execution_time": execution_time,
@@ -494,8 +728,8 @@ def batch_update():
             })
             
     except Exception as e:
-        logger.error(f"Batch UPDATE error: {str(e)}")
-        return jsonify({"error": "Batch update failed", "message": str(e)}), 500
+        logger.error("Batch UPDATE error: %s", e)
+        return _json({"error": "Batch update failed", "message": str(e)}, 500)
 
 @app.teardown_appcontext
 def close_db_connections(error):
@@ -503,8 +737,10 @@ def close_db_connections(error):
     pass
 
 if __name__ == '__main__':
+    # Local runs only; serve production traffic with gunicorn (see gunicorn.conf.py)
+    logging.getLogger('werkzeug').setLevel(logging.WARNING)
     try:
-        app.run(debug=True, host='0.0.0.0', port=5000, threaded=True)
+        app.run(debug=False, host='0.0.0.0', port=5000, threaded=True)
     except KeyboardInterrupt:
         logger.info("Shutting down...")
         db_manager.close_all_connections()
@@ -1,6 +1,7 @@
 import sqlite3
 import threading
 import time
+import re
 import json
 from contextlib import contextmanager
 from flask import Flask, request, jsonify
@@ -11,6 +12,18 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# SQLITE_BUSY and SQLITE_LOCKED; extended codes such as SQLITE_BUSY_SNAPSHOT
+# carry the primary code in their low byte
+_BUSY_CODES = {5, 6}
+
+def is_busy_error(e):
+    """Check whether an OperationalError is lock contention worth retrying"""
+    code = getattr(e, 'sqlite_errorcode', None)
+    if code is None:
+        # sqlite_errorcode only exists on Python 3.11+
+        return "database is locked" in str(e).lower()
+    return (code & 0xFF) in _BUSY_CODES
+
 class SQLiteManager:
     """Thread-safe SQLite database manager with connection pooling"""
     
@@ -20,7 +33,10 @@ class SQLiteManager:
         self.timeout = timeout
         self._local = threading.local()
         self._lock = threading.RLock()
-        self._connections = []
+        # Signalled whenever a connection is returned, so waiters wake immediately
+        self._connection_available = threading.Condition(self._lock)
+        # Every open connection, for O(1) eviction and shutdown
+        self._connections = set()
         self._available_connections = []
         
         # Initialize database and create sample table
@@ -63,33 +79,34 @@ class SQLiteManager:
     
     def _get_connection(self):
         """Get a connection from the pool or create a new one"""
+        deadline = time.time() + self.timeout
+        
         with self._lock:
-            if self._available_connections:
-                return self._available_connections.pop()
-            
-            if len(self._connections) < self.max_connections:
-                conn = sqlite3.connect(
-                    self.db_path,
-                    timeout=self.timeout,
-                    check_same_thread=False
-                )
-                conn.row_factory = sqlite3.Row
-                # Configure connection for concurrency
-                conn.execute("PRAGMA journal_mode=WAL")
-                conn.execute("PRAGMA synchronous=NORMAL")
-                conn.execute("PRAGMA busy_timeout=30000")  # 30 seconds
-                
-                self._connections.append(conn)
-                return conn
-            
-            # Wait for available connection
-            start_time = time.time()
-            while time.time() - start_time < self.timeout:
+            while True:
                 if self._available_connections:
                     return self._available_connections.pop()
-                time.sleep(0.1)
-            
-            raise Exception("Connection pool exhausted")
+                
+                if len(self._connections) < self.max_connections:
+                    conn = sqlite3.connect(
+                        self.db_path,
+                        timeout=self.timeout,
+                        check_same_thread=False,
+                        # Transactions are opened explicitly, see execute_query
+                        isolation_level=None
+                    )
+                    conn.row_factory = sqlite3.Row
+                    # Configure connection for concurrency
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.execute("PRAGMA synchronous=NORMAL")
+                    conn.execute("PRAGMA busy_timeout=30000")  # 30 seconds
+                    
+                    self._connections.add(conn)
+                    return conn
+                
+                # Wait (releasing the lock) until a connection is returned
+                remaining = deadline - time.time()
+                if remaining <= 0 or not self._connection_available.wait(remaining):
+                    raise Exception("Connection pool exhausted")
     
     def _return_connection(self, conn):
         """Return connection to the pool"""
@@ -98,37 +115,45 @@ class SQLiteManager:
                 self._available_connections.append(conn)
             else:
                 conn.close()
-                if conn in self._connections:
-                    self._connections.remove(conn)
+                self._connections.discard(conn)
+            # Either a pooled connection or a free slot is now available
+            self._connection_available.notify()
     
     def execute_query(self, query, params=None, fetch=True):
         """Execute a query with retry logic"""
         max_retries = 3
         retry_delay = 0.1
+        verb = query.lstrip()[:6].upper()
+        is_write = verb in ('INSERT', 'UPDATE', 'DELETE')
         
         for attempt in range(max_retries):
             try:
                 with self.get_connection() as conn:
                     cursor = conn.cursor()
                     
+                    if is_write:
+                        # Take the write lock up front; a deferred transaction that
+                        # upgrades mid-way can hit SQLITE_BUSY despite busy_timeout
+                        cursor.execute("BEGIN IMMEDIATE")
+                    
                     if params:
                         cursor.execute(query, params)
                     else:
                         cursor.execute(query)
                     
-                    if fetch:
-                        if query.strip().upper().startswith('SELECT'):
-                            result = [dict(row) for row in cursor.fetchall()]
-                            return {"data": result, "rowcount": len(result)}
-                        else:
-                            conn.commit()
-                            return {"data": None, "rowcount": cursor.rowcount, "lastrowid": cursor.lastrowid}
+                    if is_write:
+                        # Commit on its own cursor so rowcount/lastrowid stay intact;
+                        # anything else already ran in autocommit mode
+                        conn.execute("COMMIT")
+                    
+                    if fetch and verb == 'SELECT':
+                        result = [dict(row) for row in cursor.fetchall()]
+                        return {"data": result, "rowcount": len(result)}
                     else:
-                        conn.commit()
                         return {"data": None, "rowcount": cursor.rowcount, "lastrowid": cursor.lastrowid}
                         
             except sqlite3.OperationalError as e:
-                if "database is locked" in str(e).lower() and attempt < max_retries - 1:
+                if is_busy_error(e) and attempt < max_retries - 1:
                     logger.warning(f"Database locked, retrying... (attempt {attempt + 1})")
                     time.sleep(retry_delay * (2 ** attempt))  # Exponential backoff
                     continue
@@ -140,10 +165,11 @@ class SQLiteManager:
     def close_all_connections(self):
         """Close all connections in the pool"""
         with self._lock:
-            for conn in self._connections + self._available_connections:
+            # Idle connections are always in _connections too, so each closes once
+            for conn in self._connections:
                 try:
                     conn.close()
-                except:
+                except sqlite3.Error:
                     pass
             self._connections.clear()
             self._available_connections.clear()
@@ -155,6 +181,9 @@ app.config['JSON_SORT_KEYS'] = False
 # Initialize database manager
 db_manager = SQLiteManager('app.db')
 
+# Write/DDL keywords that /query only runs with allow_write, matched as whole words
+_DANGEROUS_SQL = re.compile(r'\b(?:DROP|DELETE|TRUNCATE|ALTER|CREATE|INSERT|UPDATE)\b', re.IGNORECASE)
+
 def handle_db_errors(f):
     """Decorator to handle database errors"""
     @wraps(f)
@@ -189,8 +218,7 @@ def execute_query():
     params = data.get('params', [])
     
     # Basic SQL injection protection
-    dangerous_keywords = ['DROP', 'DELETE', 'TRUNCATE', 'ALTER', 'CREATE', 'INSERT', 'UPDATE']
-    if any(keyword in query.upper() for keyword in dangerous_keywords):
+    if _DANGEROUS_SQL.search(query):
         if not data.get('allow_write', False):
             return jsonify({"error": "Write operations require allow_write=true"}), 403
     
@@ -306,17 +334,16 @@ def bulk_create_users():
     with db_manager.get_connection() as conn:
         cursor = conn.cursor()
         try:
-            cursor.execute("BEGIN TRANSACTION")
+            cursor.execute("BEGIN IMMEDIATE")
             
-            user_ids = []
-            for user in users:
-                cursor.execute(
-                    "INSERT INTO users (name, email) VALUES (?, ?)",
-                    [user['name'], user['email']]
-                )
-                user_ids.append(cursor.lastrowid)
+            # One prepared statement stepped for every row; the transaction holds
+            # the write lock, so the new ids are consecutive up to last_insert_rowid()
+            rows = [(user['name'], user['email']) for user in users]
+            cursor.executemany("INSERT INTO users (name, email) VALUES (?, ?)", rows)
+            last_id = cursor.execute("SELECT last_insert_rowid()").fetchone()[0]
+            user_ids = list(range(last_id - len(rows) + 1, last_id + 1))
             
-            conn.commit()
+            conn.execute("COMMIT")
             
             return jsonify({
                 "message": f"Created {len(user_ids)} users successfully",
@@ -331,15 +358,18 @@ def bulk_create_users():
 @handle_db_errors
 def get_stats():
     """Get database statistics"""
-    queries = [
-        ("SELECT COUNT(*) as total_users FROM users", "total_users"),
-        ("SELECT COUNT(*) as users_today FROM users WHERE DATE(created_at) = DATE('now')", "users_today"),
-    ]
-    
-    stats = {}
-    for query, key in queries:
-        result = db_manager.execute_query(query)
-        stats[key] = result['data'][0][key.replace('_', '')] if result['data'] else 0
+    # Both counts in one full pass over users instead of two separate COUNT queries
+    result = db_manager.execute_query(
+        "SELECT COUNT(*) as total_users, "
+        "COUNT(CASE WHEN created_at >= datetime('now', 'start of day') "
+        "AND created_at < datetime('now', 'start of day', '+1 day') THEN 1 END) as users_today "
+        "FROM users"
+    )
+    row = result['data'][0] if result['data'] else {}
+    stats = {
+        "total_users": row.get('total_users', 0),
+        "users_today": row.get('users_today', 0)
+    }
     
     return jsonify(stats)
 
@@ -349,8 +379,9 @@ def close_db_connections(error):
     pass
 
 if __name__ == '__main__':
+    # Local runs only; serve production traffic with gunicorn (see gunicorn.conf.py)
     try:
-        app.run(debug=True, host='0.0.0.0', port=5000, threaded=True)
+        app.run(debug=False, host='0.0.0.0', port=5000, threaded=True)
     except KeyboardInterrupt:
         logger.info("Shutting down...")
         db_manager.close_all_connections()
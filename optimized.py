@@ -1,16 +1,48 @@
 import sqlite3
 import threading
 import time
+import re
 import json
+import uuid
+import gzip
+from concurrent.futures import Future
 from contextlib import contextmanager
-from flask import Flask, request, jsonify
-from functools import wraps
+from flask import Flask, Request, request, jsonify
+from flask.json.provider import DefaultJSONProvider
+from functools import wraps, lru_cache
 import logging
+import orjson
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=256)
+def is_select(query):
+    """Check whether a query is a SELECT, memoized per SQL text"""
+    return query.lstrip()[:6].upper() == 'SELECT'
+
+def flight_params(params):
+    """Freeze query params into a key that tells names and value types apart"""
+    # 1, 1.0 and True compare equal but bind as different SQLite values
+    if not params:
+        return ()
+    if isinstance(params, dict):
+        return tuple(sorted((name, type(value), value) for name, value in params.items()))
+    return tuple((type(value), value) for value in params)
+
+# SQLITE_BUSY and SQLITE_LOCKED; extended codes such as SQLITE_BUSY_SNAPSHOT
+# carry the primary code in their low byte
+_BUSY_CODES = {5, 6}
+
+def is_busy_error(e):
+    """Check whether an OperationalError is lock contention worth retrying"""
+    code = getattr(e, 'sqlite_errorcode', None)
+    if code is None:
+        # sqlite_errorcode only exists on Python 3.11+
+        return "database is locked" in str(e).lower()
+    return (code & 0xFF) in _BUSY_CODES
+
 class SQLiteManager:
     """Thread-safe SQLite database manager with connection pooling"""
     
@@ -19,11 +51,21 @@ class SQLiteManager:
         self.max_connections = max_connections
         self.timeout = timeout
         self.max_retries = max_retries
+        # One connection is reserved for writes, the rest serve reads
+        self.max_readers = max(max_connections - 1, 1)
         self._local = threading.local()
-        self._lock = threading.RLock()
-        self._connections = []
+        # Only guards O(1) bookkeeping and never re-enters, so a plain Lock suffices
+        self._lock = threading.Lock()
+        # Signalled whenever a reader is returned, so waiters wake immediately
+        self._connection_available = threading.Condition(self._lock)
+        # Every open connection, for O(1) eviction and shutdown
+        self._connections = set()
         self._available_connections = []
         self._connection_count = 0
+        # Identical SELECTs already running, keyed on (query, params); callers
+        # arriving meanwhile wait on the same Future instead of re-querying
+        self._inflight = {}
+        self.max_inflight = 256
         self._active_connections = 0
         
         # Performance monitoring
@@ -33,10 +75,28 @@ class SQLiteManager:
         
         # Initialize database and create sample table
         self._init_database()
+        
+        # SQLite serializes writers anyway, so writes share one connection and
+        # never contend with each other; WAL lets the readers run alongside it
+        self._writer_sem = threading.Semaphore(1)
+        # Bumped after every commit, so reads issued after a write never join
+        # a coalesced read that started before it
+        self._write_generation = 0
+        self._writer_conn = self._open_connection()
+        
+        # PRAGMA data_version on an otherwise idle connection changes whenever any
+        # other connection commits, including those in other worker processes
+        self._version_lock = threading.Lock()
+        self._version_conn = self._open_connection(read_only=True)
+        # data_version numbering is per connection, so tag it with this instance
+        self._instance_tag = uuid.uuid4().hex[:8]
     
     def _init_database(self):
         """Initialize database with proper settings for high concurrency"""
         with sqlite3.connect(self.db_path) as conn:
+            # Only takes effect on a fresh database, before WAL mode is enabled
+            conn.execute("PRAGMA page_size=8192")
+            
             # Optimized settings for high concurrency
             conn.execute("PRAGMA journal_mode=WAL")
             conn.execute("PRAGMA synchronous=NORMAL")
@@ -63,8 +123,8 @@ class SQLiteManager:
             conn.commit()
     
     @contextmanager
-    def get_connection(self):
-        """Get a database connection with automatic cleanup"""
+    def get_reader(self):
+        """Get a read-only pooled connection with automatic cleanup"""
         conn = None
         try:
             conn = self._get_connection()
@@ -77,109 +137,206 @@ class SQLiteManager:
             if conn:
                 self._return_connection(conn)
     
+    @contextmanager
+    def get_writer(self):
+        """Get the writer connection inside a BEGIN IMMEDIATE transaction"""
+        with self._writer_sem:
+            conn = self._writer_conn
+            # Take the write lock up front instead of upgrading mid-transaction
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                conn.execute("COMMIT")
+                self._write_generation += 1
+            except Exception:
+                # A failed COMMIT (e.g. a deferred constraint) leaves the transaction
+                # open; SQLite may also have rolled back on its own already
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
+    
+    def data_version(self):
+        """Return a token that changes whenever the database is written"""
+        with self._version_lock:
+            version = self._version_conn.execute("PRAGMA data_version").fetchone()[0]
+        return f"{self._instance_tag}-{version}"
+    
+    def _open_connection(self, read_only=False):
+        """Open a connection with the per-connection settings applied"""
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.timeout,
+            check_same_thread=False,
+            # Autocommit mode: the writer opens and ends its transactions explicitly
+            isolation_level=None,
+            # sqlite3 keeps an LRU of prepared statements per connection keyed by
+            # SQL text, so the hot CRUD queries skip sqlite3_prepare_v2
+            cached_statements=256
+        )
+        
+        # Optimized connection settings for high concurrency
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=60000")  # 60 seconds
+        conn.execute("PRAGMA mmap_size=536870912")  # 512MB, read pages without a pager copy
+        conn.execute("PRAGMA cache_size=-65536")  # 64MB per connection (negative = KiB)
+        conn.execute("PRAGMA temp_store=memory")
+        if read_only:
+            conn.execute("PRAGMA query_only=1")
+        return conn
+    
     def _get_connection(self):
         """Get a connection from the pool or create a new one"""
+        deadline = time.time() + self.timeout
+        
         with self._lock:
-            if self._available_connections:
-                conn = self._available_connections.pop()
-                self._active_connections += 1
-                return conn
-            
-            if self._connection_count < self.max_connections:
-                conn = sqlite3.connect(
-                    self.db_path,
-                    timeout=self.timeout,
-                    check_same_thread=False
-                )
-                conn.row_factory = sqlite3.Row
-                
-                # Optimized connection settings for high concurrency
-                conn.execute("PRAGMA journal_mode=WAL")
-                conn.execute("PRAGMA synchronous=NORMAL")
-                conn.execute("PRAGMA busy_timeout=60000")  # 60 seconds
-                conn.execute("PRAGMA cache_size=2000")  # 2MB per connection
-                conn.execute("PRAGMA temp_store=memory")
-                
-                self._connections.append(conn)
-                self._connection_count += 1
-                self._active_connections += 1
-                return conn
-            
-            # Wait for available connection with better timeout handling
-            start_time = time.time()
-            while time.time() - start_time < self.timeout:
+            while True:
                 if self._available_connections:
                     conn = self._available_connections.pop()
                     self._active_connections += 1
                     return conn
-                time.sleep(0.05)  # Shorter sleep for better responsiveness
-            
-            raise Exception(f"Connection pool exhausted. Active: {self._active_connections}, Max: {self.max_connections}")
+                
+                if self._connection_count < self.max_readers:
+                    # Reserve the slot; connect + PRAGMAs run outside the lock
+                    self._connection_count += 1
+                    self._active_connections += 1
+                    break
+                
+                # Wait (releasing the lock) until a connection is returned
+                remaining = deadline - time.time()
+                if remaining <= 0 or not self._connection_available.wait(remaining):
+                    raise Exception(f"Connection pool exhausted. Active: {self._active_connections}, Max: {self.max_readers}")
+        
+        try:
+            conn = self._open_connection(read_only=True)
+        except Exception:
+            with self._lock:
+                self._connection_count -= 1
+                self._active_connections -= 1
+                self._connection_available.notify()
+            raise
+        
+        with self._lock:
+            self._connections.add(conn)
+        return conn
     
     def _return_connection(self, conn):
         """Return connection to the pool"""
         with self._lock:
             self._active_connections -= 1
-            if len(self._available_connections) < self.max_connections:
+            if len(self._available_connections) < self.max_readers:
                 self._available_connections.append(conn)
             else:
                 conn.close()
                 if conn in self._connections:
-                    self._connections.remove(conn)
+                    self._connections.discard(conn)
                     self._connection_count -= 1
+            # Either a pooled connection or a free slot is now available
+            self._connection_available.notify()
+    
+    def execute_query(self, query, params=None):
+        """Run a query whose verb is only known at runtime, e.g. from /query"""
+        # SELECTs go to the read-only pool, everything else to the writer
+        if is_select(query):
+            return self.execute_read(query, params)
+        return self.execute_write(query, params)
+    
+    def execute_read(self, query, params=None, version=None):
+        """Execute a SELECT, coalescing identical concurrent calls into one"""
+        # Callers tagging the result with a data_version they read beforehand only
+        # join flights started at that same version, so data never predates its tag
+        if version is None:
+            version = self._write_generation
+        try:
+            key = (query, flight_params(params), version)
+            hash(key)
+        except TypeError:
+            return self._read(query, params)
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None and len(self._inflight) < self.max_inflight
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+        
+        if future is None:
+            return self._read(query, params)
+        if not leader:
+            return future.result()
+        
+        try:
+            result = self._read(query, params)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            # Resolve the Future whatever happens, or waiters would block forever
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
     
-    def execute_query(self, query, params=None, fetch=True):
-        """Execute a query with retry logic and performance monitoring"""
+    def _read(self, query, params):
+        """Run a SELECT on a reader; WAL readers never wait on the writer, so no retries"""
+        try:
+            with self.get_reader() as conn:
+                start_ns = time.perf_counter_ns()
+                cursor = conn.execute(query, params or ())
+                # Plain tuples zipped against column names read once per query,
+                # instead of a sqlite3.Row plus a dict for every row
+                cols = [d[0] for d in cursor.description]
+                result = [dict(zip(cols, row)) for row in cursor.fetchall()]
+                execution_time = (time.perf_counter_ns() - start_ns) * 1e-9
+        except Exception as e:
+            self._error_count += 1
+            logger.error(f"Database error: {str(e)}")
+            raise
+        
+        # Log slow queries (>1 second)
+        if execution_time > 1.0 and logger.isEnabledFor(logging.WARNING):
+            logger.warning(f"Slow query detected: {execution_time:.2f}s - {query[:100]}...")
+        
+        self._request_count += 1
+        return {
+            "data": result, 
+            "rowcount": len(result),
+            "execution_time": execution_time
+        }
+    
+    def execute_write(self, query, params=None):
+        """Execute a write on the writer connection with retry logic and performance monitoring"""
         retry_delay = 0.05
         
         for attempt in range(self.max_retries):
             try:
-                with self.get_connection() as conn:
+                with self.get_writer() as conn:
                     cursor = conn.cursor()
                     
-                    start_time = time.time()
+                    start_ns = time.perf_counter_ns()
                     
                     if params:
                         cursor.execute(query, params)
                     else:
                         cursor.execute(query)
                     
-                    execution_time = time.time() - start_time
+                    execution_time = (time.perf_counter_ns() - start_ns) * 1e-9
                     
                     # Log slow queries (>1 second)
-                    if execution_time > 1.0:
+                    if execution_time > 1.0 and logger.isEnabledFor(logging.WARNING):
                         logger.warning(f"Slow query detected: {execution_time:.2f}s - {query[:100]}...")
                     
                     self._request_count += 1
                     
-                    if fetch:
-                        if query.strip().upper().startswith('SELECT'):
-                            result = [dict(row) for row in cursor.fetchall()]
-                            return {
-                                "data": result, 
-                                "rowcount": len(result),
-                                "execution_time": execution_time
-                            }
-                        else:
-                            conn.commit()
-                            return {
-                                "data": None, 
-                                "rowcount": cursor.rowcount, 
-                                "lastrowid": cursor.lastrowid,
-                                "execution_time": execution_time
-                            }
-                    else:
-                        conn.commit()
-                        return {
-                            "data": None, 
-                            "rowcount": cursor.rowcount, 
-                            "lastrowid": cursor.lastrowid,
-                            "execution_time": execution_time
-                        }
+                    # The writer transaction commits when the block exits
+                    return {
+                        "data": None, 
+                        "rowcount": cursor.rowcount, 
+                        "lastrowid": cursor.lastrowid,
+                        "execution_time": execution_time
+                    }
                         
             except sqlite3.OperationalError as e:
-                error_msg = str(e).lower()
-                if ("database is locked" in error_msg or "busy" in error_msg) and attempt < self.max_retries - 1:
+                if is_busy_error(e) and attempt < self.max_retries - 1:
                     logger.warning(f"Database busy, retrying... (attempt {attempt + 1}/{self.max_retries})")
                     time.sleep(retry_delay * (2 ** attempt))  # Exponential backoff
                     continue
@@ -208,23 +365,102 @@ class SQLiteManager:
 
     def close_all_connections(self):
         """Close all connections in the pool"""
+        # Idle connections are always in _connections too; close outside the lock
         with self._lock:
-            for conn in self._connections + self._available_connections:
-                try:
-                    conn.close()
-                except:
-                    pass
+            connections = list(self._connections)
             self._connections.clear()
             self._available_connections.clear()
             self._connection_count = 0
             self._active_connections = 0
+        
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        
+        with self._writer_sem:
+            try:
+                self._writer_conn.close()
+            except sqlite3.Error:
+                pass
+        
+        with self._version_lock:
+            try:
+                self._version_conn.close()
+            except sqlite3.Error:
+                pass
+
+class TTLCache:
+    """Thread-safe bounded dict cache whose entries expire after a fixed TTL"""
+    
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = {}
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        """Return the cached value, or None if missing or expired"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            return value
+    
+    def set(self, key, value):
+        """Cache a value, evicting the oldest entry when full"""
+        with self._lock:
+            if key not in self._data and len(self._data) >= self.maxsize:
+                # Dicts keep insertion order, so the first key is the oldest
+                del self._data[next(iter(self._data))]
+            self._data[key] = (value, time.monotonic() + self.ttl)
+    
+    def pop(self, key):
+        """Drop a single entry"""
+        with self._lock:
+            self._data.pop(key, None)
+    
+    def clear(self):
+        """Drop every entry"""
+        with self._lock:
+            self._data.clear()
+
+class ORJSONProvider(DefaultJSONProvider):
+    """JSON provider that encodes and decodes with orjson"""
+    
+    def dumps(self, obj, **kwargs):
+        # orjson always emits compact, unsorted output, so indent/sort options are ignored
+        return orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+class FastRequest(Request):
+    """Request whose get_json calls orjson directly instead of going through current_app.json"""
+    # Flask's get_json only uses json_module.loads; caching and 400/415 handling are unchanged
+    json_module = orjson
 
 # Initialize Flask app and database manager
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
+app.request_class = FastRequest
 app.config['JSON_SORT_KEYS'] = False
 
-# Initialize database manager with optimized settings for your load
-db_manager = SQLiteManager('app.db', max_connections=25, timeout=60, max_retries=5)
+# Initialize database manager with optimized settings for your load; under
+# gunicorn every worker process has its own pool, so keep it small
+db_manager = SQLiteManager('app.db', max_connections=8, timeout=60, max_retries=5)
+
+# Short-lived caches for the hot read endpoints, invalidated by the write endpoints
+_user_cache = TTLCache(maxsize=10000, ttl=5)
+_stats_cache = TTLCache(maxsize=1, ttl=10)
+
+# Write/DDL keywords that /query only runs with allow_write, matched as whole words
+_DANGEROUS_SQL = re.compile(r'\b(?:DROP|DELETE|TRUNCATE|ALTER|CREATE|INSERT|UPDATE)\b', re.IGNORECASE)
 
 def handle_db_errors(f):
     """Decorator to handle database errors"""
@@ -242,6 +478,18 @@ def handle_db_errors(f):
     
     return decorated_function
 
+# Gzipped bodies are a different representation, so their strong ETag must differ
+GZIP_ETAG_SUFFIX = '-gzip'
+
+def not_modified(etag):
+    """Build an empty 304 if the client holds either encoding of etag, else None"""
+    for candidate in (etag, etag + GZIP_ETAG_SUFFIX):
+        if request.if_none_match.contains(candidate):
+            response = app.response_class(status=304)
+            response.set_etag(candidate)
+            return response
+    return None
+
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
@@ -260,12 +508,16 @@ def execute_query():
     params = data.get('params', [])
     
     # Basic SQL injection protection
-    dangerous_keywords = ['DROP', 'DELETE', 'TRUNCATE', 'ALTER', 'CREATE', 'INSERT', 'UPDATE']
-    if any(keyword in query.upper() for keyword in dangerous_keywords):
+    is_write = _DANGEROUS_SQL.search(query) is not None
+    if is_write:
         if not data.get('allow_write', False):
             return jsonify({"error": "Write operations require allow_write=true"}), 403
     
     result = db_manager.execute_query(query, params)
+    if is_write:
+        # An arbitrary write may touch any user row or count
+        _user_cache.clear()
+        _stats_cache.clear()
     return jsonify(result)
 
 # CRUD Operations for Users table (example)
@@ -281,12 +533,20 @@ def get_users():
     limit = min(request.args.get('limit', 100, type=int), 1000)  # Cap at 1000
     offset = request.args.get('offset', 0, type=int)
     
+    # Unchanged data since the client's copy: answer 304 without running the query
+    version = db_manager.data_version()
+    etag = f'users-{version}-{limit}-{offset}'
+    cached_response = not_modified(etag)
+    if cached_response is not None:
+        return cached_response
+    
+    # Read after the version was taken, so the body is never older than its tag
+    result = db_manager.execute_read("SELECT * FROM users LIMIT ? OFFSET ?", [limit, offset], version=version)
+    
     # Add caching headers for auto-fetch optimization
-    response = app.make_response(
-        jsonify(db_manager.execute_query("SELECT * FROM users LIMIT ? OFFSET ?", [limit, offset]))
-    )
+    response = app.make_response(jsonify(result))
     response.headers['Cache-Control'] = 'public, max-age=30'  # Cache for 30 seconds
-    response.headers['ETag'] = f'users-{limit}-{offset}'
+    response.set_etag(etag)
     
     return response
 
@@ -294,13 +554,31 @@ def get_users():
 @handle_db_errors
 def get_user(user_id):
     """Get a specific user by ID"""
-    query = "SELECT * FROM users WHERE id = ?"
-    result = db_manager.execute_query(query, [user_id])
-    
-    if not result['data']:
-        return jsonify({"error": "User not found"}), 404
+    version = db_manager.data_version()
+    etag = f'user-{version}-{user_id}'
+    cached_response = not_modified(etag)
+    if cached_response is not None:
+        return cached_response
+    
+    # Entries remember the version they were read at; another worker's write
+    # never clears this cache, so anything older than the current version is stale
+    cached = _user_cache.get(user_id)
+    if cached is not None and cached[0] == version:
+        user = cached[1]
+    else:
+        query = "SELECT * FROM users WHERE id = ?"
+        result = db_manager.execute_read(query, [user_id], version=version)
+        
+        if not result['data']:
+            return jsonify({"error": "User not found"}), 404
+        
+        user = result['data'][0]
+        _user_cache.set(user_id, (version, user))
     
-    return jsonify({"data": result['data'][0]})
+    response = jsonify({"data": user})
+    response.headers['Cache-Control'] = 'public, max-age=5'
+    response.set_etag(etag)
+    return response
 
 @app.route('/users', methods=['POST'])
 @handle_db_errors
@@ -312,7 +590,8 @@ def create_user():
         return jsonify({"error": "Name and email are required"}), 400
     
     query = "INSERT INTO users (name, email) VALUES (?, ?)"
-    result = db_manager.execute_query(query, [data['name'], data['email']], fetch=False)
+    result = db_manager.execute_write(query, [data['name'], data['email']])
+    _stats_cache.clear()
     
     return jsonify({
         "message": "User created successfully",
@@ -346,7 +625,8 @@ def update_user(user_id):
     values.append(user_id)
     query = f"UPDATE users SET {', '.join(fields)} WHERE id = ?"
     
-    result = db_manager.execute_query(query, values, fetch=False)
+    result = db_manager.execute_write(query, values)
+    _user_cache.pop(user_id)
     
     if result['rowcount'] == 0:
         return jsonify({"error": "User not found"}), 404
@@ -358,7 +638,9 @@ def update_user(user_id):
 def delete_user(user_id):
     """Delete a user"""
     query = "DELETE FROM users WHERE id = ?"
-    result = db_manager.execute_query(query, [user_id], fetch=False)
+    result = db_manager.execute_write(query, [user_id])
+    _user_cache.pop(user_id)
+    _stats_cache.clear()
     
     if result['rowcount'] == 0:
         return jsonify({"error": "User not found"}), 404
@@ -383,55 +665,79 @@ def bulk_create_users():
         if 'name' not in user or 'email' not in user:
             return jsonify({"error": "Each user must have name and email"}), 400
     
-    # Bulk insert with transaction
-    with db_manager.get_connection() as conn:
+    # Bulk insert in one writer transaction, rolled back on any failure
+    with db_manager.get_writer() as conn:
         cursor = conn.cursor()
-        try:
-            cursor.execute("BEGIN TRANSACTION")
-            
-            user_ids = []
-            for user in users:
-                cursor.execute(
-                    "INSERT INTO users (name, email) VALUES (?, ?)",
-                    [user['name'], user['email']]
-                )
-                user_ids.append(cursor.lastrowid)
-            
-            conn.commit()
-            
-            return jsonify({
-                "message": f"Created {len(user_ids)} users successfully",
-                "user_ids": user_ids
-            }), 201
-            
-        except Exception as e:
-            conn.rollback()
-            raise e
+        
+        # One prepared statement stepped for every row; the writer holds the
+        # write lock, so the new ids are consecutive up to last_insert_rowid()
+        rows = [(user['name'], user['email']) for user in users]
+        cursor.executemany("INSERT INTO users (name, email) VALUES (?, ?)", rows)
+        last_id = cursor.execute("SELECT last_insert_rowid()").fetchone()[0]
+        user_ids = list(range(last_id - len(rows) + 1, last_id + 1))
+    _stats_cache.clear()
+    
+    return jsonify({
+        "message": f"Created {len(user_ids)} users successfully",
+        "user_ids": user_ids
+    }), 201
 
 @app.route('/stats', methods=['GET'])
 @handle_db_errors
 def get_stats():
     """Get database statistics"""
-    queries = [
-        ("SELECT COUNT(*) as total_users FROM users", "total_users"),
-        ("SELECT COUNT(*) as users_today FROM users WHERE DATE(created_at) = DATE('now')", "users_today"),
-    ]
-    
-    stats = {}
-    for query, key in queries:
-        result = db_manager.execute_query(query)
-        stats[key] = result['data'][0][key.replace('_', '')] if result['data'] else 0
+    stats = _stats_cache.get('stats')
+    if stats is not None:
+        return jsonify(stats)
+    
+    # Both counts in one full pass, which SQLite runs over the narrow idx_users_created_at
+    # index rather than the table (a covering scan, not a range seek)
+    result = db_manager.execute_read(
+        "SELECT COUNT(*) as total_users, "
+        "COUNT(CASE WHEN created_at >= datetime('now', 'start of day') "
+        "AND created_at < datetime('now', 'start of day', '+1 day') THEN 1 END) as users_today "
+        "FROM users"
+    )
+    row = result['data'][0] if result['data'] else {}
+    stats = {
+        "total_users": row.get('total_users', 0),
+        "users_today": row.get('users_today', 0)
+    }
     
+    _stats_cache.set('stats', stats)
     return jsonify(stats)
 
+@app.after_request
+def compress_response(response):
+    """Gzip large JSON responses for clients that accept it"""
+    if (response.status_code != 200 or response.direct_passthrough
+            or response.mimetype != 'application/json'
+            or 'Content-Encoding' in response.headers
+            or 'gzip' not in request.headers.get('Accept-Encoding', '').lower()):
+        return response
+    
+    # Small bodies are not worth the CPU, and gzip overhead can make them larger
+    body = response.get_data()
+    if len(body) < 1024:
+        return response
+    
+    response.set_data(gzip.compress(body, compresslevel=5))
+    response.headers['Content-Encoding'] = 'gzip'
+    etag, weak = response.get_etag()
+    if etag:
+        response.set_etag(etag + GZIP_ETAG_SUFFIX, weak)
+    response.vary.add('Accept-Encoding')
+    return response
+
 @app.teardown_appcontext
 def close_db_connections(error):
     """Close database connections on app shutdown"""
     pass
 
 if __name__ == '__main__':
+    # Local runs only; serve production traffic with gunicorn (see gunicorn.conf.py)
     try:
-        app.run(debug=True, host='0.0.0.0', port=5000, threaded=True)
+        app.run(debug=False, host='0.0.0.0', port=5000, threaded=True)
     except KeyboardInterrupt:
         logger.info("Shutting down...")
         db_manager.close_all_connections()